@@ -66,29 +66,20 @@ ALTER TABLE usage_records ADD COLUMN IF NOT EXISTS project_id  TEXT NOT NULL DEF
 ALTER TABLE usage_records ADD COLUMN IF NOT EXISTS workflow_id TEXT NOT NULL DEFAULT '';
 ALTER TABLE usage_records ADD COLUMN IF NOT EXISTS agent_id    TEXT NOT NULL DEFAULT '';
 
-DO $$
-BEGIN
-    ALTER TABLE usage_records DROP CONSTRAINT usage_records_organization_id_metric_period_key;
-    ALTER TABLE usage_records ADD CONSTRAINT usage_records_scope_key
-        UNIQUE (organization_id, metric, period, project_id, workflow_id, agent_id);
-EXCEPTION WHEN undefined_object THEN
-    NULL;  -- old constraint already replaced by a prior boot (idempotent re-run)
-END $$;
-
 ALTER TABLE usage_limits ADD COLUMN IF NOT EXISTS project_id  TEXT NOT NULL DEFAULT '';
 ALTER TABLE usage_limits ADD COLUMN IF NOT EXISTS workflow_id TEXT NOT NULL DEFAULT '';
 ALTER TABLE usage_limits ADD COLUMN IF NOT EXISTS agent_id    TEXT NOT NULL DEFAULT '';
-
-DO $$
-BEGIN
-    ALTER TABLE usage_limits DROP CONSTRAINT usage_limits_pkey;
-    ALTER TABLE usage_limits ADD CONSTRAINT usage_limits_scope_pkey
-        PRIMARY KEY (organization_id, metric, project_id, workflow_id, agent_id);
-EXCEPTION WHEN undefined_object THEN
-    NULL;
-END $$;
 """
 
+# (table, original org-level key, scope-aware replacement, definition).
+# Swapped once; after that the scope key exists and boot skips the DDL.
+_SCOPE_KEYS = (
+    ("usage_records", "usage_records_organization_id_metric_period_key", "usage_records_scope_key",
+     "UNIQUE (organization_id, metric, period, project_id, workflow_id, agent_id)"),
+    ("usage_limits", "usage_limits_pkey", "usage_limits_scope_pkey",
+     "PRIMARY KEY (organization_id, metric, project_id, workflow_id, agent_id)"),
+)
+
 
 class QuotaExceeded(Exception):
     def __init__(self, metric: str, used: int, limit: int):
@@ -102,8 +93,22 @@ def _current_period() -> str:
 
 
 async def init_usage_schema(conn: asyncpg.Connection) -> None:
-    await conn.execute(USAGE_SCHEMA)
-    await conn.execute(_SCOPE_COLUMNS_SCHEMA)
+    await conn.execute(USAGE_SCHEMA + _SCOPE_COLUMNS_SCHEMA)
+    existing = {
+        r["conname"] for r in await conn.fetch(
+            "SELECT conname FROM pg_constraint WHERE conname = ANY($1::text[])",
+            [new for _, _, new, _ in _SCOPE_KEYS],
+        )
+    }
+    for table, old, new, definition in _SCOPE_KEYS:
+        if new in existing:
+            continue
+        # One message, so Postgres runs it as one implicit transaction: the
+        # table is never left without a key between the DROP and the ADD.
+        await conn.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {old}; "
+            f"ALTER TABLE {table} ADD CONSTRAINT {new} {definition}"
+        )
     log.info("usage schema initialised")
 
 
@@ -5,6 +5,7 @@ The pool is stored as a module-level variable so routers can call
 get_pool() without needing a FastAPI Depends chain. set_pool() is
 called once from the lifespan context manager in main.py.
 """
+import logging
 import os
 from contextlib import asynccontextmanager
 from typing import Optional
@@ -14,6 +15,8 @@ import asyncpg
 from app.core.config import USER_ID, DEMO_PROJECT_ID
 from app.core.observability.tracer import get_tracer
 
+log = logging.getLogger(__name__)
+
 _pool: Optional[asyncpg.Pool] = None
 
 # When the pool is saturated, waiting forever turns one slow spot into a
@@ -21,6 +24,24 @@ _pool: Optional[asyncpg.Pool] = None
 # (and the request-level bulkheads shed load upstream).
 _ACQUIRE_TIMEOUT_S = float(os.getenv("DB_ACQUIRE_TIMEOUT_S", "10"))
 
+# An index build can take far longer than the pool's command_timeout on a
+# large table. asyncpg treats timeout=None as "use command_timeout", so the
+# builds get their own explicit bound.
+_INDEX_BUILD_TIMEOUT_S = float(os.getenv("DB_INDEX_BUILD_TIMEOUT_S", "3600"))
+
+# Session advisory-lock key that lets only one worker/instance run
+# build_indexes() at a time (arbitrary, just unique within this app).
+_INDEX_BUILD_LOCK_KEY = 7_241_001
+
+# (name, definition) for the indexes built by build_indexes().
+_CONCURRENT_INDEXES = (
+    ("projects_user_created_id_idx", "ON projects (user_id, created_at DESC, id DESC)"),
+    ("agent_runs_project_started_id_idx", "ON agent_runs (project_id, started_at DESC, id DESC)"),
+    ("usage_logs_user_created_idx", "ON usage_logs (user_id, created_at DESC)"),
+    ("usage_logs_details_gin", "ON usage_logs USING gin (details jsonb_path_ops)"),
+    ("agent_runs_input_data_gin", "ON agent_runs USING gin (input_data jsonb_path_ops)"),
+)
+
 
 def get_pool() -> asyncpg.Pool:
     """Return the active connection pool (guaranteed non-None after lifespan startup)."""
@@ -58,7 +79,12 @@ async def acquire_scoped(org_id: str):
 
 async def init_db(conn: asyncpg.Connection) -> None:
     """Create all core tables and seed the demo user/project if absent."""
-    await conn.execute('''
+    # Every statement is idempotent DDL with no parameters, so the batch goes
+    # out as one simple-query message — one round-trip at boot, not one per
+    # statement. Postgres runs a multi-statement message as one implicit
+    # transaction, so a failure leaves no half-applied batch behind.
+    ddl: list[str] = []
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS users (
             id             UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             email          TEXT UNIQUE NOT NULL,
@@ -70,14 +96,13 @@ async def init_db(conn: asyncpg.Connection) -> None:
         )
     ''')
     # Idempotent column migrations — safe to run on existing tables.
-    for _col_sql in (
+    ddl.extend((
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS password_hash TEXT",
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS email_verified BOOLEAN NOT NULL DEFAULT false",
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS avatar_url TEXT",
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS name TEXT",
-    ):
-        await conn.execute(_col_sql)
-    await conn.execute('''
+    ))
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS projects (
             id          UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             user_id     UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
@@ -88,7 +113,7 @@ async def init_db(conn: asyncpg.Connection) -> None:
             updated_at  TIMESTAMPTZ DEFAULT NOW()
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS conversations (
             id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
@@ -97,7 +122,7 @@ async def init_db(conn: asyncpg.Connection) -> None:
             updated_at TIMESTAMPTZ DEFAULT NOW()
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS messages (
             id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
@@ -106,7 +131,7 @@ async def init_db(conn: asyncpg.Connection) -> None:
             created_at      TIMESTAMPTZ DEFAULT NOW()
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS agent_runs (
             id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             project_id   UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
@@ -119,7 +144,7 @@ async def init_db(conn: asyncpg.Connection) -> None:
             error_message TEXT
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS usage_logs (
             id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             user_id    UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
@@ -128,7 +153,7 @@ async def init_db(conn: asyncpg.Connection) -> None:
             created_at TIMESTAMPTZ DEFAULT NOW()
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS subscriptions (
             id                       UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             email                    TEXT UNIQUE NOT NULL,
@@ -140,13 +165,13 @@ async def init_db(conn: asyncpg.Connection) -> None:
             updated_at               TIMESTAMPTZ DEFAULT NOW()
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS trials (
             email      TEXT PRIMARY KEY,
             started_at TIMESTAMPTZ DEFAULT NOW()
         )
     ''')
-    await conn.execute('''
+    ddl.append('''
         CREATE TABLE IF NOT EXISTS design_canvases (
             id          UUID        PRIMARY KEY DEFAULT gen_random_uuid(),
             project_id  UUID        NOT NULL,
@@ -159,9 +184,10 @@ async def init_db(conn: asyncpg.Connection) -> None:
             updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
         )
     ''')
-    await conn.execute(
+    ddl.append(
         "CREATE INDEX IF NOT EXISTS dc_project_idx ON design_canvases(project_id)"
     )
+    await conn.execute(";\n".join(ddl))
 
     # Seed demo user only when explicitly requested (e.g. local dev / CI).
     # Never seed in production — the demo UUID is a known value and represents
@@ -178,7 +204,67 @@ async def init_db(conn: asyncpg.Connection) -> None:
         )
 
 
+# Tables owned by the ensure_*() helpers below. The lifespan runs each at
+# boot and the agents/tasks routers call theirs again per request; once one
+# has succeeded in this process, repeat calls return without touching the
+# pool instead of re-sending the DDL on every request.
+_ensured: set[str] = set()
+
+
+async def build_indexes() -> None:
+    """
+    Build the indexes in _CONCURRENT_INDEXES. Runs as a background task
+    after startup, not in init_db: the first build on a populated table can
+    outlast the platform health-check window, and a killed-and-restarted
+    boot would only cancel it again.
+
+    The builds are CONCURRENTLY so they don't block writers; that can't run
+    inside a transaction block, so each is its own execute(). Every worker
+    and every instance in a deploy starts this task, so a session advisory
+    lock lets exactly one of them build and the rest return. While holding
+    the lock no other build can be in progress, so an INVALID index is a
+    failed or cancelled earlier build — IF NOT EXISTS would skip it forever,
+    so it is dropped and rebuilt.
+
+    List endpoints: (owner key, sort key DESC, id DESC) matches their keyset
+    ORDER BY, so each page is an index range scan instead of a sort of every
+    matching row.
+
+    JSONB containment: jsonb_path_ops only serves `@>`, so filter these
+    columns as `details @> $1::jsonb` (e.g. '{"project_id": "..."}'), never
+    `details->>'project_id' = $1` — that form can't use the index and scans
+    the whole table.
+    """
+    try:
+        async with get_pool().acquire() as conn:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", _INDEX_BUILD_LOCK_KEY):
+                return
+            invalid = await conn.fetch(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE NOT i.indisvalid AND c.relname = ANY($1::text[])",
+                [name for name, _ in _CONCURRENT_INDEXES],
+            )
+            for row in invalid:
+                await conn.execute(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {row['relname']}",
+                    timeout=_INDEX_BUILD_TIMEOUT_S,
+                )
+            for name, definition in _CONCURRENT_INDEXES:
+                await conn.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}",
+                    timeout=_INDEX_BUILD_TIMEOUT_S,
+                )
+            # On error or cancellation the pool's reset on release
+            # (pg_advisory_unlock_all) frees the lock instead.
+            await conn.execute("SELECT pg_advisory_unlock($1)", _INDEX_BUILD_LOCK_KEY)
+    except Exception:
+        # An interrupted build is left INVALID and redone on the next boot.
+        log.warning("background index build failed", exc_info=True)
+
+
 async def ensure_agents_table() -> None:
+    if "ai_agents" in _ensured:
+        return
     async with get_pool().acquire() as conn:
         await conn.execute('''
             CREATE TABLE IF NOT EXISTS ai_agents (
@@ -196,9 +282,12 @@ async def ensure_agents_table() -> None:
                 updated_at     TIMESTAMPTZ DEFAULT NOW()
             )
         ''')
+    _ensured.add("ai_agents")
 
 
 async def ensure_tasks_table() -> None:
+    if "tasks" in _ensured:
+        return
     async with get_pool().acquire() as conn:
         await conn.execute('''
             CREATE TABLE IF NOT EXISTS tasks (
@@ -271,9 +360,12 @@ async def ensure_tasks_table() -> None:
                 created_at TIMESTAMPTZ DEFAULT NOW()
             )
         ''')
+    _ensured.add("tasks")
 
 
 async def ensure_audit_table() -> None:
+    if "audit_logs" in _ensured:
+        return
     async with get_pool().acquire() as conn:
         await conn.execute('''
             CREATE TABLE IF NOT EXISTS audit_logs (
@@ -290,6 +382,7 @@ async def ensure_audit_table() -> None:
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_audit_actor    ON audit_logs(actor_email)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_audit_action   ON audit_logs(action)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_audit_created  ON audit_logs(created_at)')
+    _ensured.add("audit_logs")
 
 
 async def write_audit(
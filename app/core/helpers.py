@@ -90,6 +90,30 @@ async def resolve_project_id(conn, project_id: Optional[str], user_id: uuid.UUID
     return pid
 
 
+# ── Conversation writes ───────────────────────────────────────────────────────
+# Each is a single statement: Postgres runs it atomically and it costs one
+# round-trip, where separate INSERT/UPDATE calls could leave an empty
+# conversation (or a message with a stale updated_at) behind on failure.
+
+async def start_conversation(conn, project_id: uuid.UUID, title: str, first_message: str) -> uuid.UUID:
+    """Create a conversation together with its opening user message."""
+    return await conn.fetchval(
+        "WITH c AS (INSERT INTO conversations (project_id, title) VALUES ($1, $2) RETURNING id), "
+        "_m AS (INSERT INTO messages (conversation_id, role, content) SELECT id, 'user', $3 FROM c) "
+        "SELECT id FROM c",
+        project_id, title, first_message,
+    )
+
+
+async def append_message(conn, conversation_id: uuid.UUID, role: str, content: str) -> None:
+    """Add a message to a conversation and bump its updated_at."""
+    await conn.execute(
+        "WITH _m AS (INSERT INTO messages (conversation_id, role, content) VALUES ($1, $2, $3)) "
+        "UPDATE conversations SET updated_at=NOW() WHERE id=$1",
+        conversation_id, role, content,
+    )
+
+
 # ── Anthropic error normalisation ─────────────────────────────────────────────
 
 def anthropic_error_message(e: anthropic.BadRequestError) -> str:
@@ -0,0 +1,125 @@
+"""
+Buffered, batched writes for append-only log tables.
+
+Request paths used to INSERT one log row per call, each costing a pool
+acquire and a round-trip before the response could go out. A
+BufferedTableWriter instead queues the row and returns; a single background
+task drains the queue and writes whatever has accumulated with one COPY
+(copy_records_to_table). Under load, rows pile up while a flush is in
+flight, so batches grow with traffic and add no latency when idle.
+
+Rows are timestamped in write(), not by the column's DEFAULT NOW(). NOW()
+is the start of the flushing transaction, which would give every row in a
+batch the same created_at and lose event order.
+
+Delivery is best-effort, matching the fire-and-forget INSERTs this
+replaces. If a COPY fails, the batch is retried row by row so one bad row
+can't drop its neighbours. Writes made when the flusher isn't running
+(tests, scripts, after shutdown) or when the queue is full go straight to
+the database inline.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+from app.core.db import get_pool
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BufferedTableWriter:
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str],
+        *,
+        timestamp_column: Optional[str] = None,
+        max_batch: int = 500,
+        max_queue: int = 10_000,
+    ) -> None:
+        self.table = table
+        self._timestamped = timestamp_column is not None
+        self._n_values = len(columns)
+        self.columns = tuple(columns) + ((timestamp_column,) if timestamp_column else ())
+        self._max_batch = max_batch
+        self._max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._insert_sql = (
+            f"INSERT INTO {table} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join(f'${i}' for i in range(1, len(self.columns) + 1))})"
+        )
+
+    def start(self) -> None:
+        """Start the background flusher (called from the app lifespan)."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything queued so far, then stop the flusher."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("%s writer: shutdown flush timed out", self.table)
+
+    async def write(self, *values: Any) -> None:
+        """Queue one row, in `columns` order (the timestamp column is filled in here)."""
+        if len(values) != self._n_values:
+            raise ValueError(f"{self.table}: expected {self._n_values} values, got {len(values)}")
+        if self._timestamped:
+            values = (*values, datetime.now(timezone.utc))
+        if self._task is not None:
+            try:
+                self._queue.put_nowait(values)
+                return
+            except asyncio.QueueFull:
+                pass  # back-pressure: pay for this one row inline
+        await self._insert_rows([values])
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            # stop() clears _task before queueing the marker, so nothing can
+            # land behind it — once it shows up the queue is fully drained.
+            stopping = _STOP in batch
+            rows = [r for r in batch if r is not _STOP]
+            if rows:
+                await self._flush(rows)
+            if stopping:
+                return
+
+    async def _flush(self, rows: list) -> None:
+        try:
+            async with get_pool().acquire() as conn:
+                await conn.copy_records_to_table(self.table, records=rows, columns=self.columns)
+        except Exception:
+            log.warning("%s writer: COPY of %d rows failed, retrying row by row",
+                        self.table, len(rows), exc_info=True)
+            await self._insert_rows(rows)
+
+    async def _insert_rows(self, rows: list) -> None:
+        try:
+            async with get_pool().acquire() as conn:
+                for row in rows:
+                    try:
+                        await conn.execute(self._insert_sql, *row)
+                    except Exception:
+                        log.debug("%s writer: dropped row", self.table, exc_info=True)
+        except Exception:
+            log.debug("%s writer: insert failed", self.table, exc_info=True)
+
+
+usage_log_writer = BufferedTableWriter(
+    "usage_logs", ("user_id", "action", "details"), timestamp_column="created_at",
+)
@@ -0,0 +1,75 @@
+"""
+Fast JSON responses for row-heavy endpoints.
+
+FastAPI's default path runs a handler's return value through
+jsonable_encoder (a recursive pure-Python walk) and then stdlib json.dumps.
+A Response instance returned from a handler is passed through untouched, so
+returning FastJSONResponse skips both: orjson serializes UUID and datetime
+natively, emitting the same strings str()/.isoformat() would.
+
+JSONB columns arrive from asyncpg as already-serialized text — wrap them in
+orjson.Fragment to embed them as-is instead of json.loads()-ing them only to
+serialize them straight back.
+
+asyncpg Records can be passed as-is (a list of them, or one nested in a
+dict): orjson hands each to _default, which converts it with one C-level
+dict() call. The handler needs no per-row comprehension.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import asyncpg
+import orjson
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, asyncpg.Record):
+        return dict(o)
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Same ceiling app/core/notifications/service.py clamps its pages to.
+MAX_PAGE_SIZE = 200
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """`<epoch microseconds>_<id>` — exact at Postgres' timestamp precision
+    and URL-safe without encoding."""
+    return f"{(sort_value - _EPOCH) // timedelta(microseconds=1)}_{row_id}"
+
+
+def decode_cursor(cursor: Optional[str]) -> tuple[Optional[datetime], Optional[uuid.UUID]]:
+    """Inverse of encode_cursor; (None, None) for the first page."""
+    if not cursor:
+        return None, None
+    try:
+        micros, row_id = cursor.split("_", 1)
+        return _EPOCH + timedelta(microseconds=int(micros)), uuid.UUID(row_id)
+    except (ValueError, OverflowError):
+        raise HTTPException(422, "Invalid pagination cursor")
+
+
+def keyset_page(rows: list, *, limit: int, cursor_col: str) -> FastJSONResponse:
+    """
+    One page of a keyset-paginated list, newest first, ordered by
+    (cursor_col, id) so rows sharing a timestamp are never skipped at a page
+    boundary. The body stays a bare array so existing clients keep working.
+    A full page carries an X-Next-Cursor header; pass it back as `before` to
+    get the next page.
+    """
+    headers = {}
+    if rows and len(rows) >= limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last[cursor_col], last["id"])
+    return FastJSONResponse(rows, headers=headers)
@@ -4,6 +4,7 @@ Centralises app creation, middleware, lifespan, static files, and router registr
 so the entry point (app_main.py or main.py) stays lean.
 """
 import asyncio
+import gzip
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -22,7 +23,10 @@ from app.core.auth import extract_auth_credentials, verify_token
 from app.core.config import (
     APP_URL, DATABASE_URL, DIST_DIR, EXTRA_CORS_ORIGINS, PUBLIC_PREFIXES, WORKSPACES,
 )
-from app.core.db import init_db, set_pool, get_pool, ensure_agents_table, ensure_tasks_table, ensure_audit_table
+from app.core.db import (
+    build_indexes, init_db, set_pool, get_pool, ensure_agents_table, ensure_tasks_table, ensure_audit_table,
+)
+from app.core.log_writer import usage_log_writer
 from app.core.logging import configure_logging
 from app.core.middleware import AccessLogMiddleware, RequestIdMiddleware
 from app.core.maintenance import maintenance_loop, process_cleanup_loop, record_error
@@ -71,12 +75,19 @@ async def lifespan(app: FastAPI):
     # connection budget (e.g. Render starter Postgres allows ~97 connections:
     # DB_POOL_MAX per instance × instance count must stay below that).
     # command_timeout bounds every query — a runaway query fails loudly
-    # instead of holding a connection forever. asyncpg also caches prepared
-    # statements per connection automatically; no extra layer needed.
+    # instead of holding a connection forever. asyncpg caches prepared
+    # statements per connection automatically; the cache is sized above the
+    # app's distinct hot-statement count (asyncpg's default of 100 LRU-evicts
+    # under ~30 routers) and entries never age out, so a statement is parsed
+    # and planned once per connection. Idle connections above min_size are
+    # closed after DB_POOL_MAX_INACTIVE_S to hand slots back to Postgres.
     pool = await asyncpg.create_pool(
         DATABASE_URL,
         min_size=int(os.getenv("DB_POOL_MIN", "2")),
         max_size=int(os.getenv("DB_POOL_MAX", "10")),
+        max_inactive_connection_lifetime=float(os.getenv("DB_POOL_MAX_INACTIVE_S", "300")),
+        statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024")),
+        max_cached_statement_lifetime=0,
         command_timeout=float(os.getenv("DB_COMMAND_TIMEOUT_S", "60")),
     )
     set_pool(pool)
@@ -85,6 +96,7 @@ async def lifespan(app: FastAPI):
     await ensure_agents_table()
     await ensure_tasks_table()
     await ensure_audit_table()
+    usage_log_writer.start()
     WORKSPACES.mkdir(exist_ok=True)
     DIST_DIR.mkdir(exist_ok=True)
     (DIST_DIR / "zips").mkdir(exist_ok=True)
@@ -95,6 +107,7 @@ async def lifespan(app: FastAPI):
     ai_platform.init(pool)
     maintenance_task = asyncio.create_task(maintenance_loop())
     cleanup_task     = asyncio.create_task(process_cleanup_loop())
+    index_task       = asyncio.create_task(build_indexes())
 
     # ── Enterprise multi-tenancy + usage + org-billing schemas ─────────────
     from app.tenancy import init_tenancy_schema
@@ -288,6 +301,8 @@ async def lifespan(app: FastAPI):
     svc_registry.stop_all()
     maintenance_task.cancel()
     cleanup_task.cancel()
+    index_task.cancel()
+    await usage_log_writer.stop()
     await pool.close()
 
 
@@ -318,6 +333,70 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+# ── Static HTML ───────────────────────────────────────────────────────────────
+
+# index.html is the shell for every SPA route. Serve it from encoded bytes
+# cached per build (keyed on mtime, so a `vite build` into a running dev
+# server is still picked up) instead of read_text() + re-encode on every
+# request. A gzip copy is compressed once alongside it, so clients that
+# accept gzip get the smaller body without any per-request compression.
+# Only the bytes are shared — never a Response object, since the
+# middleware stack mutates each response's headers (X-Request-Id etc.).
+# Cache-Control stays no-store: index.html references content-hashed asset
+# names, so a cached copy would point at assets a redeploy has removed.
+_HTML_HEADERS = {"Cache-Control": "no-store, no-cache, must-revalidate"}
+_FALLBACK_HTML = (
+    "<h1>◈ Axon — Backend Running</h1><p><a href='/docs'>API Docs</a></p>"
+).encode("utf-8")
+_index_cache: dict[Path, tuple[int, bytes, bytes]] = {}
+
+
+def _index_html(index: Path) -> tuple[bytes, bytes] | None:
+    """(raw, gzipped) contents of `index`, or None when it hasn't been built."""
+    try:
+        mtime = index.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _index_cache.get(index)
+    if cached is None or cached[0] != mtime:
+        raw = index.read_bytes()
+        cached = (mtime, raw, gzip.compress(raw, compresslevel=9, mtime=0))
+        _index_cache[index] = cached
+    return cached[1], cached[2]
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if Accept-Encoding allows gzip with a non-zero q-value. An explicit
+    `gzip` entry wins over `*`; `gzip;q=0` (or `*;q=0` with no gzip entry)
+    refuses it."""
+    q_by_coding: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            q_by_coding[coding.lower()] = q
+    return q_by_coding.get("gzip", q_by_coding.get("*", 0.0)) > 0
+
+
+def _index_html_response(index: Path, request: Request) -> HTMLResponse | None:
+    content = _index_html(index)
+    if content is None:
+        return None
+    raw, gz = content
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return HTMLResponse(gz, headers={
+            **_HTML_HEADERS, "Content-Encoding": "gzip", "Vary": "Accept-Encoding",
+        })
+    return HTMLResponse(raw, headers={**_HTML_HEADERS, "Vary": "Accept-Encoding"})
+
+
 # ── App factory ───────────────────────────────────────────────────────────────
 
 def create_app() -> FastAPI:
@@ -492,6 +571,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization", "X-Sub-Token", "X-Request-Id", "X-Organization-Id"],
+        expose_headers=["X-Next-Cursor"],
     )
 
     # ── Static frontend (non-catch-all assets first) ────────────────────────
@@ -500,12 +580,11 @@ def create_app() -> FastAPI:
         app.mount("/assets", StaticFiles(directory=str(DIST / "assets")), name="assets")
 
     @app.get("/", response_class=HTMLResponse)
-    async def root():
-        index = DIST / "index.html"
-        content = index.read_text(encoding="utf-8") if index.exists() else (
-            "<h1>◈ Axon — Backend Running</h1><p><a href='/docs'>API Docs</a></p>"
+    async def root(request: Request):
+        return (
+            _index_html_response(DIST / "index.html", request)
+            or HTMLResponse(_FALLBACK_HTML, headers=_HTML_HEADERS)
         )
-        return HTMLResponse(content, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
 
     @app.get("/manifest.json")
     async def serve_manifest():
@@ -566,13 +645,10 @@ def create_app() -> FastAPI:
 
     # ── SPA catch-all (MUST be last — only reached if no API route matched) ─
     @app.get("/{full_path:path}", response_class=HTMLResponse)
-    async def spa_fallback(full_path: str):
-        index = DIST / "index.html"
-        if index.exists():
-            return HTMLResponse(
-                index.read_text(encoding="utf-8"),
-                headers={"Cache-Control": "no-store, no-cache, must-revalidate"},
-            )
-        return HTMLResponse("Not found", status_code=404)
+    async def spa_fallback(full_path: str, request: Request):
+        return (
+            _index_html_response(DIST / "index.html", request)
+            or HTMLResponse("Not found", status_code=404)
+        )
 
     return app
@@ -11,7 +11,7 @@ from app.core.ai.context.manager import budget_history
 from app.core.ai.inference.engine import InferenceEngine
 from app.core.auth import owner_user_id
 from app.core.db import get_pool, ensure_agents_table
-from app.core.helpers import resolve_project_id
+from app.core.helpers import append_message, resolve_project_id, start_conversation
 from app.core.org_quota import check_org_quota, record_org_tokens
 from app.core.security import ai_rate_limit
 
@@ -79,18 +79,18 @@ async def list_agents(request: Request):
 
 
 @router.get("/api/agents/{agent_id}")
-async def get_agent(agent_id: str, request: Request):
+async def get_agent(agent_id: uuid.UUID, request: Request):
     await ensure_agents_table()
     async with get_pool().acquire() as conn:
         uid = await owner_user_id(conn, request)
-        r = await conn.fetchrow("SELECT * FROM ai_agents WHERE id=$1 AND user_id=$2", uuid.UUID(agent_id), uid)
+        r = await conn.fetchrow("SELECT * FROM ai_agents WHERE id=$1 AND user_id=$2", agent_id, uid)
     if not r:
         raise HTTPException(404, "Agent not found")
     return dict(r)
 
 
 @router.put("/api/agents/{agent_id}")
-async def update_agent(agent_id: str, body: AgentUpdate, request: Request):
+async def update_agent(agent_id: uuid.UUID, body: AgentUpdate, request: Request):
     await ensure_agents_table()
     async with get_pool().acquire() as conn:
         uid = await owner_user_id(conn, request)
@@ -100,7 +100,7 @@ async def update_agent(agent_id: str, body: AgentUpdate, request: Request):
             "model=COALESCE($5,model), temperature=COALESCE($6,temperature), updated_at=NOW() "
             "WHERE id=$7 AND user_id=$8",
             body.name, body.avatar, body.description, body.system_prompt,
-            body.model, body.temperature, uuid.UUID(agent_id), uid,
+            body.model, body.temperature, agent_id, uid,
         )
     if result == "UPDATE 0":
         raise HTTPException(404, "Agent not found")
@@ -108,18 +108,18 @@ async def update_agent(agent_id: str, body: AgentUpdate, request: Request):
 
 
 @router.delete("/api/agents/{agent_id}")
-async def delete_agent(agent_id: str, request: Request):
+async def delete_agent(agent_id: uuid.UUID, request: Request):
     await ensure_agents_table()
     async with get_pool().acquire() as conn:
         uid = await owner_user_id(conn, request)
-        result = await conn.execute("DELETE FROM ai_agents WHERE id=$1 AND user_id=$2", uuid.UUID(agent_id), uid)
+        result = await conn.execute("DELETE FROM ai_agents WHERE id=$1 AND user_id=$2", agent_id, uid)
     if result == "DELETE 0":
         raise HTTPException(404, "Agent not found")
     return {"message": "Deleted"}
 
 
 @router.post("/api/agents/{agent_id}/chat/stream")
-async def agent_chat_stream(agent_id: str, req: AgentChatRequest, request: Request):
+async def agent_chat_stream(agent_id: uuid.UUID, req: AgentChatRequest, request: Request):
     from app.core.reliability import get_bulkhead
     bulkhead = get_bulkhead("agents", 16)
     ai_rate_limit(request)
@@ -133,7 +133,7 @@ async def agent_chat_stream(agent_id: str, req: AgentChatRequest, request: Reque
     async with get_pool().acquire() as conn:
         uid = await owner_user_id(conn, request)
         agent = await conn.fetchrow(
-            "SELECT * FROM ai_agents WHERE id=$1 AND user_id=$2", uuid.UUID(agent_id), uid,
+            "SELECT * FROM ai_agents WHERE id=$1 AND user_id=$2", agent_id, uid,
         )
         if not agent:
             raise HTTPException(404, "Agent not found")
@@ -153,17 +153,10 @@ async def agent_chat_stream(agent_id: str, req: AgentChatRequest, request: Reque
             rows = await conn.fetch(
                 "SELECT role, content FROM messages WHERE conversation_id=$1 ORDER BY created_at", conv_id)
             history = [{"role": r["role"], "content": r["content"]} for r in rows]
+            await append_message(conn, conv_id, "user", req.prompt)
         else:
             pid = await resolve_project_id(conn, req.project_id, uid)
-            conv_id = await conn.fetchval(
-                "INSERT INTO conversations (project_id, title) VALUES ($1,$2) RETURNING id",
-                pid, req.prompt[:60],
-            )
-        await conn.execute(
-            "INSERT INTO messages (conversation_id, role, content) VALUES ($1,'user',$2)",
-            conv_id, req.prompt,
-        )
-        await conn.execute("UPDATE conversations SET updated_at=NOW() WHERE id=$1", conv_id)
+            conv_id = await start_conversation(conn, pid, req.prompt[:60], req.prompt)
 
     history.append({"role": "user", "content": req.prompt})
 
@@ -233,14 +226,10 @@ async def agent_chat_stream(agent_id: str, req: AgentChatRequest, request: Reque
 
             try:
                 async with get_pool().acquire() as conn:
-                    await conn.execute(
-                        "INSERT INTO messages (conversation_id, role, content) VALUES ($1,'assistant',$2)",
-                        conv_id, full_text,
-                    )
-                    await conn.execute("UPDATE conversations SET updated_at=NOW() WHERE id=$1", conv_id)
+                    await append_message(conn, conv_id, "assistant", full_text)
                     await conn.execute(
                         "UPDATE ai_agents SET message_count=message_count+1, updated_at=NOW() WHERE id=$1",
-                        uuid.UUID(agent_id),
+                        agent_id,
                     )
             except Exception:
                 pass
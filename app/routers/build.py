@@ -20,6 +20,7 @@ from app.core.auth import owner_user_id
 from app.core.db import get_pool
 from app.core.filesystem import workspace, safe_path
 from app.core.helpers import resolve_project_id, anthropic_error_message, strip_fences
+from app.core.log_writer import usage_log_writer
 from app.core.org_quota import check_org_quota, record_org_tokens
 from app.core.security import ai_rate_limit
 from app.execution import process_mgr
@@ -194,11 +195,10 @@ async def build_program(req: BuildRequest, request: Request):
         dest.write_text(f["content"], encoding="utf-8")
         written.append(f["path"])
 
-    async with get_pool().acquire() as conn:
-        await conn.execute(
-            "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'build',$2)",
-            uid, json.dumps({"prompt": req.prompt[:80], "files": written, "project_id": req.project_id}),
-        )
+    await usage_log_writer.write(
+        uid, "build",
+        json.dumps({"prompt": req.prompt[:80], "files": written, "project_id": req.project_id}),
+    )
 
     return {
         "description": result.get("description", ""),
@@ -341,15 +341,10 @@ async def build_stream(req: BuildRequest, request: Request):
                        run_command=meta.get("run_command", ""),
                        language=meta.get("language", ""))
 
-            try:
-                async with get_pool().acquire() as conn:
-                    await conn.execute(
-                        "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'build',$2)",
-                        uid,
-                        json.dumps({"prompt": req.prompt[:80], "files": parser.completed_files}),
-                    )
-            except Exception:
-                pass
+            await usage_log_writer.write(
+                uid, "build",
+                json.dumps({"prompt": req.prompt[:80], "files": parser.completed_files}),
+            )
 
         except Exception as e:
             log.exception("build_stream error")
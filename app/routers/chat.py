@@ -14,13 +14,28 @@ from app.core.ai.context.manager import ContextBudgetError, budget_history
 from app.core.ai.inference.engine import InferenceEngine
 from app.core.auth import owner_user_id
 from app.core.db import get_pool
-from app.core.helpers import resolve_project_id, anthropic_error_message
+from app.core.helpers import (
+    append_message, anthropic_error_message, resolve_project_id, start_conversation,
+)
+from app.core.log_writer import usage_log_writer
 from app.core.org_quota import check_org_quota, record_org_tokens
 from app.core.security import ai_rate_limit
 
 log = logging.getLogger(__name__)
 router = APIRouter(tags=["chat"])
 
+# agent_runs row + its usage_logs entry in one statement (one round-trip).
+# $1 project_id, $2 input_data, $3 output_data, $4 user_id, $5 prompt preview.
+_INSERT_AGENT_RUN_SQL = (
+    "WITH new_run AS ("
+    "  INSERT INTO agent_runs (project_id, agent_type, input_data, output_data, status, completed_at) "
+    "  VALUES ($1,'claude',$2,$3,'completed',NOW()) RETURNING id"
+    ") "
+    "INSERT INTO usage_logs (user_id, action, details) "
+    "SELECT $4, 'agent_run', jsonb_build_object('run_id', id::text, 'prompt_preview', $5::text) "
+    "FROM new_run"
+)
+
 
 class RunRequest(BaseModel):
     project_id: str
@@ -62,26 +77,20 @@ async def run_stream(req: RunRequest, request: Request):
                 conv_id,
             )
             history = [{"role": r["role"], "content": r["content"]} for r in rows]
+            await append_message(conn, conv_id, "user", req.prompt)
         else:
             pid = await resolve_project_id(conn, req.project_id, uid)
-            conv_id = await conn.fetchval(
-                "INSERT INTO conversations (project_id, title) VALUES ($1, $2) RETURNING id",
-                pid, req.prompt[:60] + ("…" if len(req.prompt) > 60 else ""),
+            conv_id = await start_conversation(
+                conn, pid, req.prompt[:60] + ("…" if len(req.prompt) > 60 else ""), req.prompt,
             )
-
-        await conn.execute(
-            "INSERT INTO messages (conversation_id, role, content) VALUES ($1, 'user', $2)",
-            conv_id, req.prompt,
-        )
-        await conn.execute("UPDATE conversations SET updated_at=NOW() WHERE id=$1", conv_id)
         # Logged here (message saved) rather than only on AI success below —
         # otherwise a failed/errored AI call (e.g. a bad provider key) leaves
         # a real, user-visible message in the `messages` table (and thus in
         # the /api/stats/timeseries chart) with no corresponding entry in
         # Recent Activity, which reads only from usage_logs.
-        await conn.execute(
-            "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'message_sent',$2)",
-            uid, json.dumps({"conversation_id": str(conv_id), "prompt_preview": req.prompt[:80]}),
+        await usage_log_writer.write(
+            uid, "message_sent",
+            json.dumps({"conversation_id": str(conv_id), "prompt_preview": req.prompt[:80]}),
         )
 
     history.append({"role": "user", "content": req.prompt})
@@ -160,20 +169,12 @@ async def run_stream(req: RunRequest, request: Request):
 
             try:
                 async with get_pool().acquire() as conn:
-                    await conn.execute(
-                        "INSERT INTO messages (conversation_id, role, content) VALUES ($1, 'assistant', $2)",
-                        conv_id, full_text,
-                    )
-                    await conn.execute("UPDATE conversations SET updated_at=NOW() WHERE id=$1", conv_id)
+                    await append_message(conn, conv_id, "assistant", full_text)
                     pid2 = await resolve_project_id(conn, req.project_id, uid)
-                    run_id = await conn.fetchval(
-                        "INSERT INTO agent_runs (project_id, agent_type, input_data, output_data, status, completed_at) "
-                        "VALUES ($1,'claude',$2,$3,'completed',NOW()) RETURNING id",
-                        pid2, json.dumps({"prompt": req.prompt}), json.dumps({"summary": full_text}),
-                    )
                     await conn.execute(
-                        "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'agent_run',$2)",
-                        uid, json.dumps({"run_id": str(run_id), "prompt_preview": req.prompt[:80]}),
+                        _INSERT_AGENT_RUN_SQL,
+                        pid2, json.dumps({"prompt": req.prompt}), json.dumps({"summary": full_text}),
+                        uid, req.prompt[:80],
                     )
             except Exception:
                 pass
@@ -232,14 +233,10 @@ async def run_agent(req: RunRequest, request: Request):
     summary = resp.content
     async with get_pool().acquire() as conn:
         pid = await resolve_project_id(conn, req.project_id, uid)
-        run_id = await conn.fetchval(
-            "INSERT INTO agent_runs (project_id, agent_type, input_data, output_data, status, completed_at) "
-            "VALUES ($1,'claude',$2,$3,'completed',NOW()) RETURNING id",
-            pid, json.dumps({"prompt": req.prompt}), json.dumps({"summary": summary}),
-        )
         await conn.execute(
-            "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'agent_run',$2)",
-            uid, json.dumps({"run_id": str(run_id), "prompt_preview": req.prompt[:80]}),
+            _INSERT_AGENT_RUN_SQL,
+            pid, json.dumps({"prompt": req.prompt}), json.dumps({"summary": summary}),
+            uid, req.prompt[:80],
         )
     return {"result": {"summary": summary}}
 
@@ -250,12 +247,14 @@ async def create_conversation(body: ConversationCreate, request: Request):
         uid = await owner_user_id(conn, request)
         pid = await resolve_project_id(conn, body.project_id, uid)
         cid = await conn.fetchval(
-            "INSERT INTO conversations (project_id, title) VALUES ($1,$2) RETURNING id",
-            pid, body.title,
-        )
-        await conn.execute(
-            "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'conversation_created',$2)",
-            uid, json.dumps({"conversation_id": str(cid), "title": body.title}),
+            "WITH new_c AS ("
+            "  INSERT INTO conversations (project_id, title) VALUES ($1,$2::text) RETURNING id"
+            "), _log AS ("
+            "  INSERT INTO usage_logs (user_id, action, details) "
+            "  SELECT $3, 'conversation_created', "
+            "         jsonb_build_object('conversation_id', id::text, 'title', $2::text) FROM new_c"
+            ") SELECT id FROM new_c",
+            pid, body.title, uid,
         )
     return {"id": str(cid), "title": body.title}
 
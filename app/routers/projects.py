@@ -1,4 +1,3 @@
-import json
 import uuid
 from typing import Optional
 
@@ -7,9 +6,22 @@ from pydantic import BaseModel, Field, field_validator
 
 from app.core.auth import owner_user_id as _owner_user_id
 from app.core.db import get_pool
+from app.core.responses import MAX_PAGE_SIZE, decode_cursor, keyset_page
 
 router = APIRouter(tags=["projects"])
 
+# Shared by the list and detail reads. asyncpg's per-connection statement
+# cache (sized in app/factory.py) keys on exact SQL text, so hot statements
+# are built from fixed strings — no values interpolated — and each is
+# parsed and planned once per connection, not once per request.
+_PROJECT_COLS = "id, name, description, status, created_at, updated_at"
+_LIST_PROJECTS_SQL = (
+    f"SELECT {_PROJECT_COLS} FROM projects "
+    "WHERE user_id=$1 AND ($2::timestamptz IS NULL OR (created_at, id) < ($2, $3::uuid)) "
+    "ORDER BY created_at DESC, id DESC LIMIT $4"
+)
+_GET_PROJECT_SQL = f"SELECT {_PROJECT_COLS} FROM projects WHERE id=$1 AND user_id=$2"
+
 
 def _validate_project_name(v: str) -> str:
     v = v.strip()
@@ -42,48 +54,38 @@ class ProjectUpdate(BaseModel):
 async def create_project(project: ProjectCreate, request: Request):
     async with get_pool().acquire() as conn:
         uid = await _owner_user_id(conn, request)
+        # One statement, one round-trip: the usage_logs row is written by a
+        # data-modifying CTE off the new project's id.
         pid = await conn.fetchval(
-            "INSERT INTO projects (user_id, name, description) VALUES ($1,$2,$3) RETURNING id",
+            "WITH new_p AS ("
+            "  INSERT INTO projects (user_id, name, description) VALUES ($1,$2::text,$3) RETURNING id"
+            "), _log AS ("
+            "  INSERT INTO usage_logs (user_id, action, details) "
+            "  SELECT $1, 'project_created', "
+            "         jsonb_build_object('project_id', id::text, 'name', $2::text) FROM new_p"
+            ") SELECT id FROM new_p",
             uid, project.name, project.description,
         )
-        await conn.execute(
-            "INSERT INTO usage_logs (user_id, action, details) VALUES ($1,'project_created',$2)",
-            uid, json.dumps({"project_id": str(pid), "name": project.name}),
-        )
     return {"id": str(pid), "message": "Project created"}
 
 
 @router.get("/api/projects")
-async def list_projects(request: Request):
+async def list_projects(
+    request: Request, before: Optional[str] = None, limit: int = MAX_PAGE_SIZE,
+):
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    before_ts, before_id = decode_cursor(before)
     async with get_pool().acquire() as conn:
         uid = await _owner_user_id(conn, request)
-        rows = await conn.fetch(
-            "SELECT id, name, description, status, created_at, updated_at "
-            "FROM projects WHERE user_id=$1 ORDER BY created_at DESC",
-            uid,
-        )
-    return [
-        {
-            "id": str(r["id"]),
-            "name": r["name"],
-            "description": r["description"],
-            "status": r["status"],
-            "created_at": r["created_at"].isoformat(),
-            "updated_at": r["updated_at"].isoformat(),
-        }
-        for r in rows
-    ]
+        rows = await conn.fetch(_LIST_PROJECTS_SQL, uid, before_ts, before_id, limit)
+    return keyset_page(rows, limit=limit, cursor_col="created_at")
 
 
 @router.get("/api/projects/{project_id}")
-async def get_project(project_id: str, request: Request):
+async def get_project(project_id: uuid.UUID, request: Request):
     async with get_pool().acquire() as conn:
         uid = await _owner_user_id(conn, request)
-        row = await conn.fetchrow(
-            "SELECT id, name, description, status, created_at, updated_at "
-            "FROM projects WHERE id=$1 AND user_id=$2",
-            uuid.UUID(project_id), uid,
-        )
+        row = await conn.fetchrow(_GET_PROJECT_SQL, project_id, uid)
     if not row:
         raise HTTPException(404, "Project not found")
     return {
@@ -97,28 +99,28 @@ async def get_project(project_id: str, request: Request):
 
 
 @router.put("/api/projects/{project_id}")
-async def update_project(project_id: str, project: ProjectUpdate, request: Request):
+async def update_project(project_id: uuid.UUID, project: ProjectUpdate, request: Request):
     async with get_pool().acquire() as conn:
         uid = await _owner_user_id(conn, request)
-        result = await conn.execute(
+        updated = await conn.fetchval(
             "UPDATE projects "
             "SET name=COALESCE($1,name), description=COALESCE($2,description), updated_at=NOW() "
-            "WHERE id=$3 AND user_id=$4",
-            project.name, project.description, uuid.UUID(project_id), uid,
+            "WHERE id=$3 AND user_id=$4 RETURNING id",
+            project.name, project.description, project_id, uid,
         )
-    if result == "UPDATE 0":
+    if updated is None:
         raise HTTPException(404, "Project not found")
     return {"message": "Updated"}
 
 
 @router.delete("/api/projects/{project_id}")
-async def delete_project(project_id: str, request: Request):
+async def delete_project(project_id: uuid.UUID, request: Request):
     async with get_pool().acquire() as conn:
         uid = await _owner_user_id(conn, request)
-        result = await conn.execute(
-            "DELETE FROM projects WHERE id=$1 AND user_id=$2",
-            uuid.UUID(project_id), uid,
+        deleted = await conn.fetchval(
+            "DELETE FROM projects WHERE id=$1 AND user_id=$2 RETURNING id",
+            project_id, uid,
         )
-    if result == "DELETE 0":
+    if deleted is None:
         raise HTTPException(404, "Project not found")
     return {"message": "Deleted"}
@@ -3,10 +3,12 @@ import uuid
 from datetime import date, timedelta
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request
 
 from app.core.auth import owner_user_id
 from app.core.db import get_pool
+from app.core.responses import MAX_PAGE_SIZE, FastJSONResponse, decode_cursor, keyset_page
 
 router = APIRouter(tags=["stats"])
 
@@ -86,32 +88,37 @@ async def stats_timeseries(request: Request, days: int = 14):
 
 
 @router.get("/api/agent-runs")
-async def list_agent_runs(request: Request, project_id: Optional[str] = None):
+async def list_agent_runs(
+    request: Request, project_id: Optional[uuid.UUID] = None,
+    before: Optional[str] = None, limit: int = MAX_PAGE_SIZE,
+):
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    before_ts, before_id = decode_cursor(before)
     async with get_pool().acquire() as conn:
         uid = await owner_user_id(conn, request)
         if project_id:
             owned = await conn.fetchval(
                 "SELECT 1 FROM projects WHERE id=$1 AND user_id=$2",
-                uuid.UUID(project_id), uid,
+                project_id, uid,
             )
             if not owned:
                 raise HTTPException(404, "Project not found")
             rows = await conn.fetch(
                 "SELECT id,project_id,agent_type,status,started_at,completed_at "
-                "FROM agent_runs WHERE project_id=$1 ORDER BY started_at DESC",
-                uuid.UUID(project_id),
+                "FROM agent_runs WHERE project_id=$1 "
+                "AND ($2::timestamptz IS NULL OR (started_at, id) < ($2, $3::uuid)) "
+                "ORDER BY started_at DESC, id DESC LIMIT $4",
+                project_id, before_ts, before_id, limit,
             )
         else:
             rows = await conn.fetch(
                 "SELECT ar.id,ar.project_id,ar.agent_type,ar.status,ar.started_at,ar.completed_at "
                 "FROM agent_runs ar JOIN projects p ON ar.project_id=p.id "
-                "WHERE p.user_id=$1 ORDER BY ar.started_at DESC",
-                uid,
+                "WHERE p.user_id=$1 AND ($2::timestamptz IS NULL OR (ar.started_at, ar.id) < ($2, $3::uuid)) "
+                "ORDER BY ar.started_at DESC, ar.id DESC LIMIT $4",
+                uid, before_ts, before_id, limit,
             )
-    return [{"id": str(r["id"]), "project_id": str(r["project_id"]), "agent_type": r["agent_type"],
-             "status": r["status"], "started_at": r["started_at"].isoformat(),
-             "completed_at": r["completed_at"].isoformat() if r["completed_at"] else None}
-            for r in rows]
+    return keyset_page(rows, limit=limit, cursor_col="started_at")
 
 
 @router.get("/api/usage-logs")
@@ -119,9 +126,12 @@ async def list_usage_logs(request: Request):
     async with get_pool().acquire() as conn:
         uid = await owner_user_id(conn, request)
         rows = await conn.fetch(
-            "SELECT id, action, details, created_at FROM usage_logs "
-            "WHERE user_id=$1 ORDER BY created_at DESC LIMIT 100", uid,
+            "SELECT id, action, COALESCE(details, '{}'::jsonb) AS details, created_at "
+            "FROM usage_logs WHERE user_id=$1 ORDER BY created_at DESC LIMIT 100", uid,
         )
-    return [{"id": str(r["id"]), "action": r["action"],
-             "details": dict(r["details"]) if r["details"] else {},
-             "created_at": r["created_at"].isoformat()} for r in rows]
+    # details is JSONB text from asyncpg — embedded verbatim, never re-parsed.
+    return FastJSONResponse([
+        {"id": r["id"], "action": r["action"],
+         "details": orjson.Fragment(r["details"]), "created_at": r["created_at"]}
+        for r in rows
+    ])
@@ -24,4 +24,20 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
+    # Same server settings as the Dockerfile CMD. loop/http stay "auto" here
+    # (uvloop + httptools when installed) because uvloop has no Windows build
+    # and start.bat launches this file. Multiple workers need the import
+    # string; a single worker gets the app object directly, because the
+    # string would import this module again as "app_main" and build a second
+    # app on top of the one running as __main__.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        app if workers == 1 else "app_main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8000)),
+        loop="auto",
+        http="auto",
+        workers=workers,
+        limit_concurrency=int(os.getenv("UVICORN_LIMIT_CONCURRENCY", "1000")),
+        backlog=int(os.getenv("UVICORN_BACKLOG", "2048")),
+    )
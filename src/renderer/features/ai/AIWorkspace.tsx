@@ -6,7 +6,7 @@
 import { useState, useEffect, useCallback } from "react";
 import { useTranslation } from "react-i18next";
 import { useToast } from "../../contexts/toast";
-import { apiFetch, parseJSON } from "../../utils/api";
+import { apiFetch, apiJSONAllPages, parseJSON } from "../../utils/api";
 import { S } from "../../styles/theme";
 import { GoldButton } from "../../shared/ui/gold";
 import type { Project, Agent } from "../../types";
@@ -36,8 +36,7 @@ export function AIWorkspace() {
   }, [toast, t]);
 
   useEffect(() => {
-    apiFetch("/api/projects")
-      .then(r => parseJSON<Project[]>(r, "/api/projects"))
+    apiJSONAllPages<Project>("/api/projects")
       .then(setProjects)
       .catch(() => {});
     void Promise.resolve().then(loadAgents);
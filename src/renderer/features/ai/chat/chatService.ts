@@ -1,9 +1,8 @@
-import { apiFetch, parseJSON, authH, API } from "../../../shared/utils/api";
+import { apiFetch, apiJSONAllPages, parseJSON, authH, API } from "../../../shared/utils/api";
 import type { Conv, Message, Project, Agent, Task } from "../../../shared/types";
 
 export async function fetchProjects(): Promise<Project[]> {
-  const r = await apiFetch("/api/projects");
-  return parseJSON<Project[]>(r, "/api/projects");
+  return apiJSONAllPages<Project>("/api/projects");
 }
 
 export async function fetchAgents(): Promise<Agent[]> {
@@ -8,7 +8,7 @@
 import { useState, useEffect, useCallback } from "react";
 import { useTranslation } from "react-i18next";
 import { useToast } from "../../contexts/toast";
-import { apiFetch, parseJSON } from "../../utils/api";
+import { apiFetch, apiJSONAllPages, parseJSON } from "../../utils/api";
 import { StatusBadge } from "../../components/ui/StatusBadge";
 import { S } from "../../styles/theme";
 import { GoldButton } from "../../shared/ui/gold";
@@ -53,8 +53,7 @@ export function DevWorkspace() {
   const [runError, setRunError]        = useState<RunErrorType>(null);
 
   useEffect(() => {
-    apiFetch("/api/projects")
-      .then(r => parseJSON<Project[]>(r, "/api/projects"))
+    apiJSONAllPages<Project>("/api/projects")
       .then(setProjects)
       .catch(() => {});
   }, []);
@@ -3,7 +3,7 @@ import { useTranslation } from "react-i18next";
 import { useAppContext } from "../../contexts/app";
 import { useLangContext } from "../../contexts/lang";
 import { useToast } from "../../contexts/toast";
-import { apiFetch, parseJSON } from "../../utils/api";
+import { apiFetch, apiJSONAllPages, parseJSON } from "../../utils/api";
 import { relTime } from "../../utils/time";
 import { motion } from "framer-motion";
 import { ProjectAvatar } from "../../components/ui/ProjectAvatar";
@@ -49,7 +49,7 @@ export function HomePage() {
 
   // ── Projects state ────────────────────────────────────────────────────────
   const projectsQuery = useAsyncData<Project[]>(
-    () => apiFetch("/api/projects").then(r => parseJSON<Project[]>(r, "/api/projects")),
+    () => apiJSONAllPages<Project>("/api/projects"),
     [],
   );
   const projects    = projectsQuery.data ?? [];
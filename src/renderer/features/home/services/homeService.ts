@@ -1,4 +1,4 @@
-import { apiFetch, parseJSON } from "../../../shared/utils/api";
+import { apiFetch, apiJSONAllPages, parseJSON } from "../../../shared/utils/api";
 import type { Project } from "../../../shared/types";
 
 export interface StatsResponse {
@@ -28,8 +28,7 @@ export async function fetchTimeseries(days = 14): Promise<TimeseriesResponse> {
 }
 
 export async function fetchProjects(): Promise<Project[]> {
-  const r = await apiFetch("/api/projects");
-  return parseJSON<Project[]>(r, "/api/projects");
+  return apiJSONAllPages<Project>("/api/projects");
 }
 
 export async function createProject(name: string, description: string): Promise<Project> {
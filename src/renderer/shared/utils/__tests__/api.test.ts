@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
-import { apiFetch, authH } from "../api";
+import { apiFetch, apiJSONAllPages, authH } from "../api";
 
 /**
  * Covers the auth-token-lifecycle fix: apiFetch() now attempts exactly one
@@ -126,3 +126,20 @@ describe("authH — always sends both credential headers when available", () =>
     expect(headers["X-Organization-Id"]).toBe("org-1");
   });
 });
+
+describe("apiJSONAllPages — follows X-Next-Cursor", () => {
+  it("keeps requesting with before=<cursor> until a page has no cursor", async () => {
+    const fetchMock = fetch as unknown as ReturnType<typeof vi.fn>;
+    const page1 = jsonResponse(200, [{ id: "a" }, { id: "b" }]);
+    page1.headers.set("X-Next-Cursor", "1767225600000000_b");
+    fetchMock
+      .mockResolvedValueOnce(page1)
+      .mockResolvedValueOnce(jsonResponse(200, [{ id: "c" }]));
+
+    const items = await apiJSONAllPages<{ id: string }>("/api/projects");
+
+    expect(items.map(p => p.id)).toEqual(["a", "b", "c"]);
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(fetchMock.mock.calls[1][0]).toBe("/api/projects?before=1767225600000000_b");
+  });
+});
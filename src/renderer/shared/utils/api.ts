@@ -196,3 +196,21 @@ export async function apiJSON<T>(path: string, init?: RequestInit): Promise<T> {
   const res = await apiFetch(path, init);
   return parseJSON<T>(res, `${API}${path}`);
 }
+
+/**
+ * Fetch every page of a keyset-paginated list endpoint (/api/projects,
+ * /api/agent-runs). Each response body is one page; a full page carries an
+ * X-Next-Cursor header that is passed back as `before` until it's absent.
+ */
+export async function apiJSONAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  const sep = path.includes("?") ? "&" : "?";
+  let cursor: string | null = null;
+  do {
+    const pagePath: string = cursor ? `${path}${sep}before=${encodeURIComponent(cursor)}` : path;
+    const res = await apiFetch(pagePath);
+    items.push(...await parseJSON<T[]>(res, `${API}${path}`));
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
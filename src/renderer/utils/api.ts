@@ -1,2 +1,2 @@
 // Re-export shim — canonical location is shared/utils/api.ts
-export { apiFetch, apiJSON, parseJSON, authH, API, getToken, APIError } from "../shared/utils/api";
+export { apiFetch, apiJSON, apiJSONAllPages, parseJSON, authH, API, getToken, APIError } from "../shared/utils/api";
@@ -796,6 +796,240 @@ class TestRlsPolicyShape(unittest.TestCase):
         self.assertNotIn("subscription_plans", table_cols)
 
 
+class _TxnTrackingConn:
+    """Just enough of asyncpg.Connection for asyncpg's real Transaction class
+    to run its state checks. Whether a transaction is open is tracked from
+    the statements sent, the way the server's ReadyForQuery status is — so
+    a hand-rolled BEGIN followed by conn.transaction() fails here exactly as
+    it does against Postgres."""
+
+    _pool_release_ctr = 0
+
+    def __init__(self, fetchrow_result=None):
+        from types import SimpleNamespace
+        self._top_xact = None
+        self._in_txn = False
+        self._ids = 0
+        self.sent: list[str] = []
+        self.args: list[tuple] = []
+        self._protocol = SimpleNamespace(is_in_transaction=lambda: self._in_txn)
+        self._fetchrow_result = fetchrow_result
+
+    def is_closed(self):
+        return False
+
+    def _get_unique_id(self, prefix):
+        self._ids += 1
+        return f"__asyncpg_{prefix}_{self._ids}__"
+
+    def transaction(self):
+        from asyncpg.transaction import Transaction
+        return Transaction(self, None, False, False)
+
+    async def execute(self, sql, *args):
+        self.sent.append(sql)
+        self.args.append(args)
+        head = sql.strip().rstrip(";").upper()
+        if head.startswith("BEGIN"):
+            self._in_txn = True
+        elif head in ("COMMIT", "ROLLBACK"):
+            self._in_txn = False
+        return "OK"
+
+    async def fetchrow(self, sql, *args):
+        self.sent.append(sql)
+        return self._fetchrow_result
+
+
+class TestAcquireScoped(unittest.TestCase):
+    """acquire_scoped() runs the caller inside one asyncpg transaction with
+    the org GUC set, committing on success and rolling back on error."""
+
+    def _pool(self, conn):
+        pool = mock.MagicMock()
+        pool.acquire.return_value.__aenter__ = mock.AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = mock.AsyncMock(return_value=False)
+        return pool
+
+    def test_guc_set_inside_transaction_then_commit(self):
+        from app.core.db import acquire_scoped
+        org = "11111111-2222-3333-4444-555555555555"
+        conn = _TxnTrackingConn()
+
+        async def go():
+            async with acquire_scoped(org) as c:
+                await c.execute("SELECT 1")
+
+        with mock.patch("app.core.db.get_pool", return_value=self._pool(conn)):
+            run(go())
+        self.assertTrue(conn.sent[0].startswith("BEGIN"))
+        self.assertEqual(conn.sent[1], "SELECT set_config('app.current_org_id', $1, true)")
+        self.assertEqual(conn.args[1], (org,))
+        self.assertTrue(conn.sent[-1].startswith("COMMIT"))
+
+    def test_error_rolls_back(self):
+        from app.core.db import acquire_scoped
+        conn = _TxnTrackingConn()
+
+        async def go():
+            async with acquire_scoped("11111111-2222-3333-4444-555555555555"):
+                raise RuntimeError("boom")
+
+        with mock.patch("app.core.db.get_pool", return_value=self._pool(conn)):
+            with self.assertRaises(RuntimeError):
+                run(go())
+        self.assertTrue(conn.sent[-1].startswith("ROLLBACK"))
+        self.assertFalse(conn._in_txn)
+
+    def test_caller_transaction_nests_as_savepoint(self):
+        """Callers such as PgMarketplaceStore.record_install open
+        conn.transaction() inside the scoped block; that must become a
+        savepoint, not an InterfaceError."""
+        from app.core.db import acquire_scoped
+        conn = _TxnTrackingConn()
+
+        async def go():
+            async with acquire_scoped("11111111-2222-3333-4444-555555555555") as c:
+                async with c.transaction():
+                    await c.execute("SELECT 1")
+
+        with mock.patch("app.core.db.get_pool", return_value=self._pool(conn)):
+            run(go())
+        self.assertTrue(conn.sent[0].startswith("BEGIN"))
+        self.assertTrue(any(s.startswith("SAVEPOINT") for s in conn.sent))
+        self.assertTrue(conn.sent[-1].startswith("COMMIT"))
+
+    def test_record_install_through_real_acquire_scoped(self):
+        from app.marketplace.store import PgMarketplaceStore
+        conn = _TxnTrackingConn(fetchrow_result=None)  # item not found
+        store = PgMarketplaceStore(mock.MagicMock())
+
+        with mock.patch("app.core.db.get_pool", return_value=self._pool(conn)):
+            result = run(store.record_install(
+                "missing-item", org_id="11111111-2222-3333-4444-555555555555",
+            ))
+        self.assertIsNone(result)
+        self.assertFalse(conn._in_txn)
+        self.assertTrue(conn.sent[-1].startswith("COMMIT"))
+
+
+class TestEnsureTablesRunOnce(unittest.TestCase):
+    """ensure_*_table() is called per request by the agents/tasks routers —
+    the DDL must only go out until the first success."""
+
+    def test_ddl_sent_once_per_process(self):
+        from app.core import db
+        conn = mock.AsyncMock()
+        pool = mock.MagicMock()
+        pool.acquire.return_value.__aenter__ = mock.AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = mock.AsyncMock(return_value=False)
+
+        with mock.patch.object(db, "_ensured", set()), \
+             mock.patch("app.core.db.get_pool", return_value=pool):
+            run(db.ensure_agents_table())
+            run(db.ensure_agents_table())
+        self.assertEqual(conn.execute.call_count, 1)
+        self.assertEqual(pool.acquire.call_count, 1)
+
+    def test_failure_is_retried_next_call(self):
+        from app.core import db
+        conn = mock.AsyncMock()
+        conn.execute = mock.AsyncMock(side_effect=[RuntimeError("db down"), None])
+        pool = mock.MagicMock()
+        pool.acquire.return_value.__aenter__ = mock.AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = mock.AsyncMock(return_value=False)
+
+        with mock.patch.object(db, "_ensured", set()), \
+             mock.patch("app.core.db.get_pool", return_value=pool):
+            with self.assertRaises(RuntimeError):
+                run(db.ensure_agents_table())
+            run(db.ensure_agents_table())
+        self.assertEqual(conn.execute.call_count, 2)
+
+
+class TestBuildIndexes(unittest.TestCase):
+    """build_indexes() runs after startup under an advisory lock; the lock
+    holder drops and rebuilds INVALID indexes left by a cancelled build."""
+
+    def _run(self, *, locked, invalid=()):
+        from app.core import db
+        conn = mock.AsyncMock()
+        conn.fetchval = mock.AsyncMock(return_value=locked)
+        conn.fetch = mock.AsyncMock(return_value=[{"relname": n} for n in invalid])
+        pool = mock.MagicMock()
+        pool.acquire.return_value.__aenter__ = mock.AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = mock.AsyncMock(return_value=False)
+        with mock.patch("app.core.db.get_pool", return_value=pool):
+            run(db.build_indexes())
+        return conn
+
+    def test_invalid_index_is_dropped_before_create(self):
+        from app.core import db
+        conn = self._run(locked=True, invalid=["usage_logs_details_gin"])
+
+        sql = [c.args[0] for c in conn.execute.call_args_list]
+        drop = sql.index("DROP INDEX CONCURRENTLY IF EXISTS usage_logs_details_gin")
+        create = next(i for i, q in enumerate(sql) if "IF NOT EXISTS usage_logs_details_gin" in q)
+        self.assertLess(drop, create)
+        self.assertTrue(sql[-1].startswith("SELECT pg_advisory_unlock"))
+        # Builds are not bounded by the pool's command_timeout.
+        for c in conn.execute.call_args_list:
+            if "INDEX CONCURRENTLY" in c.args[0]:
+                self.assertEqual(c.kwargs["timeout"], db._INDEX_BUILD_TIMEOUT_S)
+
+    def test_another_holder_of_the_lock_builds_instead(self):
+        """An index still being built elsewhere is also INVALID — never drop it."""
+        conn = self._run(locked=False, invalid=["usage_logs_details_gin"])
+        conn.fetch.assert_not_called()
+        conn.execute.assert_not_called()
+
+    def test_failure_is_logged_not_raised(self):
+        from app.core import db
+        conn = mock.AsyncMock()
+        conn.fetchval = mock.AsyncMock(side_effect=RuntimeError("db down"))
+        pool = mock.MagicMock()
+        pool.acquire.return_value.__aenter__ = mock.AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = mock.AsyncMock(return_value=False)
+        with mock.patch("app.core.db.get_pool", return_value=pool), \
+             self.assertLogs("app.core.db", level="WARNING"):
+            run(db.build_indexes())
+
+    def test_init_db_does_not_build_them(self):
+        from app.core import db
+        conn = mock.AsyncMock()
+        run(db.init_db(conn))
+        self.assertFalse(any("CONCURRENTLY" in c.args[0] for c in conn.execute.call_args_list))
+
+
+class TestUsageScopeKeys(unittest.TestCase):
+    """init_usage_schema() swaps the org-level keys for the scope-aware ones
+    once, then skips that DDL on every later boot."""
+
+    def _conn(self, existing):
+        conn = mock.AsyncMock()
+        conn.fetch = mock.AsyncMock(return_value=[{"conname": n} for n in existing])
+        return conn
+
+    def test_fresh_schema_swaps_both_keys(self):
+        from app.billing.usage import init_usage_schema
+        conn = self._conn([])
+        run(init_usage_schema(conn))
+        sent = [c.args[0] for c in conn.execute.call_args_list]
+        self.assertFalse(any("DO $$" in sql for sql in sent))
+        swaps = [sql for sql in sent if "ADD CONSTRAINT" in sql]
+        self.assertEqual(len(swaps), 2)
+        self.assertIn("DROP CONSTRAINT IF EXISTS usage_records_organization_id_metric_period_key", swaps[0])
+        self.assertIn("ADD CONSTRAINT usage_limits_scope_pkey", swaps[1])
+
+    def test_existing_scope_keys_skip_the_ddl(self):
+        from app.billing.usage import init_usage_schema
+        conn = self._conn(["usage_records_scope_key", "usage_limits_scope_pkey"])
+        run(init_usage_schema(conn))
+        sent = [c.args[0] for c in conn.execute.call_args_list]
+        self.assertEqual(len(sent), 1)  # just the idempotent CREATE/ADD COLUMN batch
+        self.assertNotIn("CONSTRAINT", sent[0])
+
+
 # ── Trial support ───────────────────────────────────────────────────────────────
 
 class TestTrialSupport(unittest.TestCase):
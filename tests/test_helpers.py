@@ -145,6 +145,36 @@ class TestResolveProjectId:
             await main._resolve_project_id(conn, "not-a-uuid", self.USER_A)
 
 
+# ── Conversation writes ────────────────────────────────────────────────────────
+
+class TestConversationWrites:
+    """Each conversation write is one statement — atomic, one round-trip."""
+
+    async def test_start_conversation_inserts_conversation_and_message_together(self):
+        from app.core.helpers import start_conversation
+        conn = AsyncMock()
+        conv_id, pid = uuid.uuid4(), uuid.uuid4()
+        conn.fetchval = AsyncMock(return_value=conv_id)
+
+        assert await start_conversation(conn, pid, "Title", "hello") == conv_id
+        conn.fetchval.assert_awaited_once()
+        conn.execute.assert_not_awaited()
+        sql, *params = conn.fetchval.call_args.args
+        assert "INSERT INTO conversations" in sql and "INSERT INTO messages" in sql
+        assert params == [pid, "Title", "hello"]
+
+    async def test_append_message_bumps_updated_at_in_the_same_statement(self):
+        from app.core.helpers import append_message
+        conn = AsyncMock()
+        conv_id = uuid.uuid4()
+
+        await append_message(conn, conv_id, "assistant", "reply")
+        conn.execute.assert_awaited_once()
+        sql, *params = conn.execute.call_args.args
+        assert "INSERT INTO messages" in sql and "UPDATE conversations SET updated_at=NOW()" in sql
+        assert params == [conv_id, "assistant", "reply"]
+
+
 # ── Rate limiter ───────────────────────────────────────────────────────────────
 
 class TestRateLimit:
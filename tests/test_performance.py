@@ -9,8 +9,11 @@ against a real server outside CI (a saturated shared runner cannot hold
 wall-clock latency SLOs; see PERFORMANCE.md).
 """
 import asyncio
+import os
 import time
 
+import pytest
+
 from app.core.jobs.queue import JobQueue, JobStatus
 from app.core.reliability import Bulkhead, BulkheadFull, CircuitBreaker
 
@@ -150,3 +153,80 @@ class TestCacheHitPath:
         assert hit == {"v": 1} and calls["n"] == 1
         assert hit_ms < 25, f"cache hit took {hit_ms:.1f}ms"
         await invalidate(key)
+
+
+class TestIndexHtmlCache:
+    def test_reads_and_compresses_once_per_build(self, tmp_path, monkeypatch):
+        import gzip
+        from pathlib import Path
+        from app.factory import _index_html
+
+        index = tmp_path / "index.html"
+        index.write_text("<p>v1 ◈</p>", encoding="utf-8")
+        reads = {"n": 0}
+        real_read_bytes = Path.read_bytes
+
+        def counting_read_bytes(self):
+            reads["n"] += 1
+            return real_read_bytes(self)
+
+        monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+        for _ in range(100):
+            raw, gz = _index_html(index)
+            assert raw == "<p>v1 ◈</p>".encode("utf-8")
+            assert gzip.decompress(gz) == raw
+        assert reads["n"] == 1
+
+        # A rebuild (new mtime) is picked up without a restart.
+        index.write_text("<p>v2</p>", encoding="utf-8")
+        os.utime(index, ns=(index.stat().st_atime_ns, index.stat().st_mtime_ns + 1_000_000))
+        assert _index_html(index)[0] == b"<p>v2</p>"
+        assert reads["n"] == 2
+
+    def test_missing_index_returns_none(self, tmp_path):
+        from app.factory import _index_html
+        assert _index_html(tmp_path / "index.html") is None
+
+    def test_gzip_served_only_when_accepted(self, tmp_path):
+        import gzip
+        from fastapi import FastAPI, Request
+        from fastapi.testclient import TestClient
+        from app.factory import _index_html_response
+
+        index = tmp_path / "index.html"
+        index.write_text("<p>" + "x" * 2000 + "</p>", encoding="utf-8")
+        app = FastAPI()
+
+        @app.get("/")
+        async def root(request: Request):
+            return _index_html_response(index, request)
+
+        c = TestClient(app)
+        plain = c.get("/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["vary"] == "Accept-Encoding"
+        assert plain.content == index.read_bytes()
+
+        # Bypass httpx's transparent decoding to see the wire body.
+        with c.stream("GET", "/", headers={"Accept-Encoding": "gzip"}) as res:
+            wire = b"".join(res.iter_raw())
+        assert res.headers["content-encoding"] == "gzip"
+        assert len(wire) < len(index.read_bytes())
+        assert gzip.decompress(wire) == index.read_bytes()
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("*", True),
+        ("", False),
+        ("identity", False),
+        ("gzip;q=0", False),
+        ("identity, gzip;q=0", False),
+        ("GZIP;Q=0.000", False),
+        ("*;q=0", False),
+        ("gzip;q=0.5, *;q=0", True),
+    ])
+    def test_accepts_gzip_honours_q_values(self, header, expected):
+        from app.factory import _accepts_gzip
+        assert _accepts_gzip(header) is expected
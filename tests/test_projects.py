@@ -180,3 +180,155 @@ class TestProjectDataIsolation:
 
         assert res.status_code == 401
         assert "register" in res.json()["detail"].lower()
+
+
+class TestCreateProjectRoundTrips:
+    def test_project_and_usage_log_written_in_one_statement(self):
+        """The usage_logs row rides along in the same CTE — no second execute()."""
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool_with_user(OWNER_A_UID)
+
+        with mock_pool_ctx, \
+             patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.post(
+                    "/api/projects",
+                    json={"name": "Alpha", "description": "d"},
+                    headers={"X-Sub-Token": ALICE_TOKEN},
+                )
+
+        assert res.status_code == 201
+        conn.execute.assert_not_called()
+        sql, *params = conn.fetchval.call_args_list[-1].args
+        assert "INSERT INTO projects" in sql and "INSERT INTO usage_logs" in sql
+        assert params == [OWNER_A_UID, "Alpha", "d"]
+
+
+class TestListProjectsKeysetPagination:
+    def _rows(self, n):
+        import datetime
+        base = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+        return [
+            {"id": uuid.uuid4(), "name": f"p{i}", "description": None, "status": "active",
+             "created_at": base - datetime.timedelta(minutes=i),
+             "updated_at": base - datetime.timedelta(minutes=i)}
+            for i in range(n)
+        ]
+
+    def test_full_page_cursor_round_trips_as_created_at_and_id(self):
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool_with_user(OWNER_A_UID)
+        rows = self._rows(2)
+        conn.fetch = AsyncMock(return_value=rows)
+
+        with mock_pool_ctx, \
+             patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                first = c.get("/api/projects", params={"limit": 2},
+                              headers={"X-Sub-Token": ALICE_TOKEN})
+                cursor = first.headers["X-Next-Cursor"]
+                c.get("/api/projects", params={"limit": 2, "before": cursor},
+                      headers={"X-Sub-Token": ALICE_TOKEN})
+
+        assert first.status_code == 200
+        assert [p["name"] for p in first.json()] == ["p0", "p1"]
+        sql, uid, before_ts, before_id, limit = conn.fetch.call_args.args
+        assert "(created_at, id) < ($2, $3::uuid)" in sql
+        assert "ORDER BY created_at DESC, id DESC LIMIT $4" in sql
+        assert uid == OWNER_A_UID and limit == 2
+        # Ties on created_at are broken by id, so no row is skipped at the boundary.
+        assert (before_ts, before_id) == (rows[-1]["created_at"], rows[-1]["id"])
+
+    def test_malformed_cursor_is_422(self):
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool_with_user(OWNER_A_UID)
+        conn.fetch = AsyncMock(return_value=[])
+
+        with mock_pool_ctx, \
+             patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.get("/api/projects", params={"before": "2026-02-01T00:00:00+00:00"},
+                            headers={"X-Sub-Token": ALICE_TOKEN})
+
+        assert res.status_code == 422
+        conn.fetch.assert_not_called()
+
+    def test_out_of_range_cursor_is_422_not_500(self):
+        """timedelta overflows (OverflowError, not ValueError) on huge micros."""
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool_with_user(OWNER_A_UID)
+
+        with mock_pool_ctx, \
+             patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.get(
+                    "/api/projects",
+                    params={"before": "99999999999999999999_00000000-0000-0000-0000-000000000000"},
+                    headers={"X-Sub-Token": ALICE_TOKEN},
+                )
+
+        assert res.status_code == 422
+        conn.fetch.assert_not_called()
+
+    def test_last_page_has_no_cursor_and_limit_is_clamped(self):
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool_with_user(OWNER_A_UID)
+        conn.fetch = AsyncMock(return_value=self._rows(1))
+
+        with mock_pool_ctx, \
+             patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.get("/api/projects", params={"limit": 10_000},
+                            headers={"X-Sub-Token": ALICE_TOKEN})
+
+        assert res.status_code == 200
+        assert "X-Next-Cursor" not in res.headers
+        assert conn.fetch.call_args.args[2:] == (None, None, 200)
+
+
+class TestProjectIdValidation:
+    def test_malformed_project_id_is_422_before_any_query(self):
+        """Parsed by FastAPI at the edge — previously uuid.UUID() raised in the handler (500)."""
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool_with_user(OWNER_A_UID)
+
+        with mock_pool_ctx, \
+             patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.get("/api/projects/not-a-uuid", headers={"X-Sub-Token": ALICE_TOKEN})
+
+        assert res.status_code == 422
+        conn.fetchrow.assert_not_called()
+
+
+class TestUpdateDeleteNotFound:
+    """404 comes from RETURNING id yielding no row, not from parsing the
+    command tag — a foreign or missing id must still be a 404."""
+
+    def _pool(self, *fetchval_results):
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(side_effect=list(fetchval_results))
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        return patch("app.routers.projects.get_pool", return_value=pool), conn
+
+    def test_delete_foreign_project_is_404(self):
+        app = _make_app()
+        pool_ctx, conn = self._pool(OWNER_B_UID, None)  # owner uid, then no row deleted
+        with pool_ctx, patch("app.core.auth.owner_email", return_value=OWNER_B_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.delete(f"/api/projects/{uuid.uuid4()}", headers={"X-Sub-Token": BOB_TOKEN})
+        assert res.status_code == 404
+        assert "RETURNING id" in conn.fetchval.call_args.args[0]
+
+    def test_update_own_project_succeeds(self):
+        app = _make_app()
+        pid = uuid.uuid4()
+        pool_ctx, conn = self._pool(OWNER_A_UID, pid)
+        with pool_ctx, patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.put(f"/api/projects/{pid}", json={"name": "Renamed"},
+                            headers={"X-Sub-Token": ALICE_TOKEN})
+        assert res.status_code == 200
+        conn.execute.assert_not_called()
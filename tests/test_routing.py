@@ -88,3 +88,12 @@ async def test_spa_fallback_serves_frontend_for_non_api(app):
             ct = r.headers.get("content-type", "")
             if r.status_code == 200:
                 assert "text/html" in ct, f"{path} returned 200 but content-type is {ct}"
+
+
+@pytest.mark.anyio
+async def test_cors_exposes_pagination_cursor(app):
+    """Cross-origin fetch() can only read X-Next-Cursor if CORS exposes it."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.get("/api/health", headers={"Origin": "http://localhost:5173"})
+    assert "X-Next-Cursor" in r.headers.get("access-control-expose-headers", "")
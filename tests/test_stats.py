@@ -143,3 +143,87 @@ class TestStatsIsScoped:
                 )
 
         assert res.status_code == 404
+
+
+class TestListSerialization:
+    """The list endpoints serialize rows with orjson — output must match the
+    str()/isoformat() shape the hand-built dicts used to produce."""
+
+    def test_agent_runs_uuid_and_datetime_shape(self):
+        import datetime
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool()
+        run_id, project_id = uuid.uuid4(), uuid.uuid4()
+        started = datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+        conn.fetch = AsyncMock(return_value=[{
+            "id": run_id, "project_id": project_id, "agent_type": "claude",
+            "status": "completed", "started_at": started, "completed_at": None,
+        }])
+
+        with mock_pool_ctx, patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.get("/api/agent-runs", headers={"X-Sub-Token": "alice-token"})
+
+        assert res.status_code == 200
+        assert res.json() == [{
+            "id": str(run_id), "project_id": str(project_id), "agent_type": "claude",
+            "status": "completed", "started_at": started.isoformat(), "completed_at": None,
+        }]
+
+    def test_asyncpg_records_serialize_without_a_dict_pass(self):
+        """Handlers hand asyncpg Records straight to FastJSONResponse."""
+        import datetime
+        from asyncpg.protocol.protocol import _create_record
+        from app.core.responses import FastJSONResponse
+        run_id = uuid.uuid4()
+        started = datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc)
+        rec = _create_record({"id": 0, "started_at": 1}, (run_id, started))
+
+        body = FastJSONResponse([rec], headers={}).body
+        assert body == f'[{{"id":"{run_id}","started_at":"{started.isoformat()}"}}]'.encode()
+
+    def test_unknown_types_still_fail_loudly(self):
+        import pytest
+        from app.core.responses import FastJSONResponse
+        with pytest.raises(TypeError):
+            FastJSONResponse([object()])
+
+    def test_usage_log_details_embedded_as_json_object(self):
+        import datetime
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool()
+        log_id = uuid.uuid4()
+        created = datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc)
+        # asyncpg hands JSONB back as text
+        conn.fetch = AsyncMock(return_value=[{
+            "id": log_id, "action": "build",
+            "details": '{"project_id": "p1", "n": 2}', "created_at": created,
+        }])
+
+        with mock_pool_ctx, patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                res = c.get("/api/usage-logs", headers={"X-Sub-Token": "alice-token"})
+
+        assert res.status_code == 200
+        assert res.json() == [{
+            "id": str(log_id), "action": "build",
+            "details": {"project_id": "p1", "n": 2}, "created_at": created.isoformat(),
+        }]
+
+    def test_list_queries_never_fetch_unused_columns(self):
+        """agent_runs.input_data/output_data are large JSONB blobs the list
+        response drops — selecting them would pay detoast + wire cost for
+        nothing. usage_logs likewise only fetches what the response carries."""
+        app = _make_app()
+        mock_pool_ctx, conn = _mock_pool()
+
+        with mock_pool_ctx, patch("app.core.auth.owner_email", return_value=OWNER_A_EMAIL):
+            with TestClient(app, raise_server_exceptions=False) as c:
+                assert c.get("/api/agent-runs", headers={"X-Sub-Token": "alice-token"}).status_code == 200
+                assert c.get("/api/usage-logs", headers={"X-Sub-Token": "alice-token"}).status_code == 200
+
+        runs_sql, logs_sql = (call.args[0] for call in conn.fetch.call_args_list)
+        for sql in (runs_sql, logs_sql):
+            assert "*" not in sql.split("FROM")[0]
+        assert "input_data" not in runs_sql and "output_data" not in runs_sql
+        assert "user_id" not in logs_sql.split("FROM")[0]